@@ -0,0 +1,4 @@
+from vector import Vector
+from line import Line
+from plane import Plane
+from linsys import LinearSystem, Parametrization
@@ -0,0 +1,92 @@
+from decimal import Decimal, localcontext
+
+UNIQUE = 'unique'
+NO_SOLUTIONS = 'none'
+INF_SOLUTIONS = 'infinite'
+
+DECIMAL_NEEDS_3_VARIABLES_MSG = 'The decimal backend only solves systems in 3 variables'
+EMPTY_SYSTEM_MSG = 'The system must have at least one equation'
+ROWS_MUST_HAVE_SAME_LENGTH_MSG = 'Every equation must have the same number of coefficients'
+FLOAT_HAS_NO_PIVOTING_MSG = 'The float backend solves with an SVD and takes no pivoting strategy'
+
+
+def split_rows(rows):
+    # Every row is [a_1, ..., a_n, k] for the equation a_1 x_1 + ... + a_n x_n = k
+    if not rows:
+        raise ValueError(EMPTY_SYSTEM_MSG)
+    width = len(rows[0])
+    if width < 2 or any(len(row) != width for row in rows):
+        raise ValueError(ROWS_MUST_HAVE_SAME_LENGTH_MSG)
+    return [row[:-1] for row in rows], [row[-1] for row in rows]
+
+
+def solve_with_decimal(rows, pivoting=None, precision=30):
+    from vector import Vector
+    from plane import Plane
+    from linsys import LinearSystem, Parametrization
+
+    coefficients, constants = split_rows(rows)
+    if len(coefficients[0]) != 3:
+        raise ValueError(DECIMAL_NEEDS_3_VARIABLES_MSG)
+
+    with localcontext() as context:
+        context.prec = precision
+        planes = [Plane(normal_vector=Vector([Decimal(str(x)) for x in a]), constant_term=Decimal(str(k)))
+                  for a, k in zip(coefficients, constants)]
+        system = LinearSystem(planes)
+        result = system.solve(pivoting)
+
+    if result is None:
+        output = {'status': NO_SOLUTIONS}
+    elif isinstance(result, Parametrization):
+        output = {'status': INF_SOLUTIONS,
+                  'basepoint': [float(x) for x in result.basepoint.coordinates],
+                  'directions': [[float(x) for x in v.coordinates] for v in result.direction_vectors]}
+    else:
+        output = {'status': UNIQUE, 'solution': [float(x) for x in result.coordinates]}
+
+    if system.growth_factor is not None:
+        output['growth_factor'] = float(system.growth_factor)
+    if system.pivot_ratio is not None:
+        output['pivot_ratio'] = float(system.pivot_ratio)
+    if system.condition_estimate is not None:
+        output['condition_estimate'] = float(system.condition_estimate)
+    return output
+
+
+def solve_with_float(rows, pivoting=None, tolerance=1e-10):
+    # The SVD has no pivoting strategy to choose: pivoting is only part of the signature to keep the backends
+    # interchangeable and must be left as None
+    if pivoting is not None:
+        raise ValueError(FLOAT_HAS_NO_PIVOTING_MSG)
+
+    import numpy as np
+
+    coefficients, constants = split_rows(rows)
+    a = np.array(coefficients, dtype=float)
+    k = np.array(constants, dtype=float)
+
+    # Rank revealing SVD: minimum norm solution, consistency check and null space in one factorization
+    u, singular_values, vt = np.linalg.svd(a)
+    rank = int(np.sum(singular_values > tolerance * max(singular_values[0], 1.0)))
+    x = vt[:rank].T.dot(u[:, :rank].T.dot(k) / singular_values[:rank])
+
+    scale = max(singular_values[0] * np.abs(x).max(), np.abs(k).max(), 1.0)
+    if np.abs(a.dot(x) - k).max() > tolerance * scale:
+        output = {'status': NO_SOLUTIONS}
+    elif rank < a.shape[1]:
+        output = {'status': INF_SOLUTIONS, 'basepoint': x.tolist(), 'directions': vt[rank:].tolist()}
+    else:
+        output = {'status': UNIQUE, 'solution': x.tolist()}
+
+    # 2-norm condition number, only meaningful when the coefficient matrix has full rank
+    output['rank'] = rank
+    if rank and rank == min(a.shape):
+        output['condition_number'] = float(singular_values[0] / singular_values[rank - 1])
+    return output
+
+
+BACKENDS = {
+    'decimal': solve_with_decimal,
+    'float': solve_with_float,
+}
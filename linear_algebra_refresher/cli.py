@@ -0,0 +1,136 @@
+import argparse
+import json
+import sys
+from collections import deque
+from functools import partial
+from itertools import islice
+
+from backends import BACKENDS
+
+IN_FLIGHT_CHUNKS_PER_WORKER = 3
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m linear_algebra_refresher',
+        description='Solve linear systems streamed as JSON lines. Every input line is either a list of rows '
+                    '[a_1, ..., a_n, k] or an object {"id": ..., "equations": [rows]}. One JSON line is written '
+                    'per system, in input order.')
+    parser.add_argument('files', nargs='*', help='input files, standard input when none (or "-") is given')
+    parser.add_argument('-b', '--backend', choices=sorted(BACKENDS), default='decimal')
+    parser.add_argument('-p', '--pivoting', choices=['partial', 'rook', 'complete'],
+                        help='pivoting strategy of the decimal backend (not accepted with --backend float), '
+                             'none by default')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--chunksize', type=int, default=64, help='systems handed to a worker at a time')
+    parser.add_argument('-o', '--output', help='output file, standard output when not given')
+    arguments = parser.parse_args(argv)
+
+    if arguments.workers < 1:
+        parser.error('--workers must be at least 1')
+    if arguments.chunksize < 1:
+        parser.error('--chunksize must be at least 1')
+    if arguments.pivoting is not None and arguments.backend != 'decimal':
+        parser.error('--pivoting only applies to the decimal backend')
+    return arguments
+
+
+def read_lines(paths):
+    if not paths:
+        paths = ['-']
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path)
+        try:
+            for line in stream:
+                if line.strip():
+                    yield line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def solve_line(backend, pivoting, line):
+    # Never raises, so that a single malformed system does not stop the stream
+    system_id = None
+    try:
+        system = json.loads(line)
+        if isinstance(system, dict):
+            system_id = system.get('id')
+            rows = system['equations']
+        else:
+            rows = system
+        result = BACKENDS[backend](rows, pivoting)
+    except Exception as e:
+        result = {'status': 'error', 'error': str(e) or e.__class__.__name__}
+
+    if system_id is not None:
+        result['id'] = system_id
+    return json.dumps(result)
+
+
+def solve_chunk(backend, pivoting, lines):
+    return [solve_line(backend, pivoting, line) for line in lines]
+
+
+def solve_in_pool(pool, backend, pivoting, lines, chunksize, in_flight):
+    # Pool.imap would drain the whole input into its task queue, so at most in_flight chunks are queued or
+    # running at any time. Results are yielded in input order as soon as the oldest chunk is done, while the
+    # following chunks keep the other workers busy.
+    pending = deque()
+    for chunk in iter(lambda: list(islice(lines, chunksize)), []):
+        pending.append(pool.apply_async(solve_chunk, (backend, pivoting, chunk)))
+        if len(pending) >= in_flight:
+            for result in pending.popleft().get():
+                yield result
+
+    while pending:
+        for result in pending.popleft().get():
+            yield result
+
+
+def unreadable_files(paths):
+    unreadable = []
+    for path in paths:
+        if path == '-':
+            continue
+        try:
+            open(path).close()
+        except (IOError, OSError) as e:
+            unreadable.append('{}: {}'.format(path, e.strerror or e))
+    return unreadable
+
+
+def main(argv=None):
+    arguments = parse_arguments(sys.argv[1:] if argv is None else argv)
+
+    # Fail before writing any output rather than in the middle of the stream
+    errors = unreadable_files(arguments.files)
+    if errors:
+        for error in errors:
+            sys.stderr.write('Cannot read {}\n'.format(error))
+        return 1
+
+    solve = partial(solve_line, arguments.backend, arguments.pivoting)
+    lines = read_lines(arguments.files)
+    output = open(arguments.output, 'w') if arguments.output else sys.stdout
+
+    pool = None
+    if arguments.workers > 1:
+        from multiprocessing import Pool
+        pool = Pool(arguments.workers)
+        results = solve_in_pool(pool, arguments.backend, arguments.pivoting, lines, arguments.chunksize,
+                                IN_FLIGHT_CHUNKS_PER_WORKER * arguments.workers)
+    else:
+        results = (solve(line) for line in lines)
+
+    try:
+        for result in results:
+            output.write(result + '\n')
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if output is not sys.stdout:
+            output.close()
+
+    return 0
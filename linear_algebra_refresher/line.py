@@ -2,8 +2,6 @@ from decimal import Decimal, getcontext
 
 from vector import Vector
 
-getcontext().prec = 30
-
 
 class Line(object):
 
@@ -21,27 +19,40 @@ class Line(object):
             constant_term = Decimal('0')
         self.constant_term = Decimal(constant_term)
 
-        self.basepoint = None
-        self.set_basepoint()
+        self.reset_basepoint()
+
+    @property
+    def basepoint(self):
+        # Computed on first use, most of the lines built while eliminating never need one
+        if not self._basepoint_is_set:
+            self.set_basepoint()
+        return self._basepoint
+
+    def reset_basepoint(self):
+        # To be called after updating the normal vector or the constant term in place
+        self._basepoint = None
+        self._basepoint_is_set = False
 
     def set_basepoint(self):
         try:
             n = self.normal_vector
             c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
+            basepoint_coords = [Decimal(0)]*self.dimension
 
             initial_index = Line.first_nonzero_index(n.coordinates)
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self._basepoint = Vector.from_decimals(basepoint_coords)
 
         except Exception as e:
             if str(e) == Line.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
+                self._basepoint = None
             else:
                 raise e
 
+        self._basepoint_is_set = True
+
     def __str__(self):
 
         num_decimal_places = 3
@@ -132,6 +143,51 @@ class Line(object):
 
             return Vector([x, y])
 
+    @staticmethod
+    def intersect_all(lines, others=None, region=None, cells=None, tolerance=1e-10):
+        # Batched version of intersection_with. Intersects every pair of lines (i < j) or, when others is
+        # given, every line against every other line. Parallel and coincident pairs are skipped.
+        # region = (lower_corner, upper_corner) keeps only the points inside the box: the box is split into a
+        # cells x cells grid and only lines crossing a common cell are paired (see spatial.candidate_pair_blocks).
+        # Returns (i, j, points): index arrays into lines / others and an (p, 2) array of intersection points.
+        import numpy as np
+        import spatial
+
+        normals, constants = spatial.normals_and_constants(lines, 2)
+        other_normals, other_constants = normals, constants
+        if others is not None:
+            other_normals, other_constants = spatial.normals_and_constants(others, 2)
+
+        if region is not None and cells is None:
+            cells = spatial.default_cells(len(lines) + len(others or []), 2)
+
+        blocks = []
+        for i, j, cell in spatial.candidate_pair_blocks(normals, constants,
+                                                        None if others is None else other_normals,
+                                                        None if others is None else other_constants,
+                                                        region, cells):
+            a, b = normals[i, 0], normals[i, 1]
+            c, d = other_normals[j, 0], other_normals[j, 1]
+            k1, k2 = constants[i], other_constants[j]
+            determinant = (a * d) - (b * c)
+
+            keep = np.abs(determinant) > tolerance              # Nearly parallel pairs that hashed apart
+            determinant = determinant[keep]
+            x = ((d * k1) - (b * k2))[keep] / determinant
+            y = ((a * k2) - (c * k1))[keep] / determinant
+            points = np.column_stack((x, y))
+            i, j = i[keep], j[keep]
+
+            if cell is not None:                                # Each point is reported by the cell owning it
+                keep = spatial.inside_region(points, region)
+                keep[keep] = spatial.cell_of_points(points[keep], region, cells) == cell
+                points, i, j = points[keep], i[keep], j[keep]
+
+            blocks.append((i, j, points))
+
+        empty = (np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros((0, 2)))
+        return spatial.concatenate_blocks(blocks, empty)
+
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
@@ -146,6 +202,8 @@ class MyDecimal(Decimal):
 
 
 def main():
+    getcontext().prec = 30
+
     first = Vector([4.046, 2.836])
     k1 = 1.21
     second = Vector([10.115, 7.09])
@@ -1,17 +1,21 @@
 from decimal import Decimal, getcontext
-from copy import deepcopy
 
-from vector import Vector
+from vector import Vector, MutableVector
 from plane import Plane
 
-getcontext().prec = 30
-
 
 class LinearSystem(object):
 
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
+    UNKNOWN_PIVOTING_MSG = 'Pivoting must be one of None, partial, rook or complete'
+
+    NO_PIVOTING = None          # Original behaviour: the first nonzero row below, only when the pivot is near zero
+    PARTIAL_PIVOTING = 'partial'
+    ROOK_PIVOTING = 'rook'
+    COMPLETE_PIVOTING = 'complete'
+    PIVOTING_STRATEGIES = (NO_PIVOTING, PARTIAL_PIVOTING, ROOK_PIVOTING, COMPLETE_PIVOTING)
 
     def __init__(self, planes):
         try:
@@ -22,6 +26,12 @@ class LinearSystem(object):
             self.planes = planes
             self.dimension = d
 
+            # column_permutation[p] is the original variable stored in column p after any column swap
+            self.column_permutation = list(range(d))
+            self.growth_factor = None
+            self.pivot_ratio = None
+            self.condition_estimate = None
+
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
@@ -30,15 +40,47 @@ class LinearSystem(object):
         self[row1] = self[row2]
         self[row2] = temp
 
+    def swap_columns(self, col1, col2):
+        if col1 == col2:
+            return
+
+        for i, p in enumerate(self.planes):
+            coordinates = list(p.normal_vector.coordinates)
+            coordinates[col1], coordinates[col2] = coordinates[col2], coordinates[col1]
+            self.planes[i] = Plane(p.normal_vector.from_decimals(coordinates), p.constant_term)
+
+        permutation = self.column_permutation
+        permutation[col1], permutation[col2] = permutation[col2], permutation[col1]
+
     def multiply_coefficient_and_row(self, coefficient, row):
-        self[row] = Plane(self[row].normal_vector.times_scalar(coefficient), self[row].constant_term * coefficient)
+        p = self[row]
+        if isinstance(p.normal_vector, MutableVector):     # Row of a working copy, updated in place
+            p.normal_vector *= coefficient
+            p.constant_term *= coefficient
+            p.reset_basepoint()
+            return
+
+        self[row] = Plane(p.normal_vector.times_scalar(coefficient), p.constant_term * coefficient)
 
     def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to):
         added_to = self[row_to_be_added_to]
         add = self[row_to_add]
-        self[row_to_be_added_to] = Plane(added_to.normal_vector.plus(add.normal_vector.times_scalar(coefficient)),
+        if isinstance(added_to.normal_vector, MutableVector):
+            added_to.normal_vector.add_scaled(coefficient, add.normal_vector)
+            added_to.constant_term += add.constant_term * coefficient
+            added_to.reset_basepoint()
+            return
+
+        self[row_to_be_added_to] = Plane(added_to.normal_vector.axpy(coefficient, add.normal_vector),
                                          added_to.constant_term + (add.constant_term * coefficient))
 
+    def working_copy(self):
+        # Copy whose planes own MutableVector normals, so that the row operations update them in place instead
+        # of building a new Plane and Vector per step. The planes of this system are never modified.
+        system = LinearSystem([Plane(p.normal_vector.mutable_copy(), p.constant_term) for p in self.planes])
+        system.column_permutation = list(self.column_permutation)
+        return system
+
     def indices_of_first_nonzero_terms_in_each_row(self):
         num_equations = len(self)
 
@@ -55,24 +97,166 @@ class LinearSystem(object):
 
         return indices
 
-    def compute_triangular_form(self):
-        system = deepcopy(self)
+    def compute_triangular_form(self, pivoting=NO_PIVOTING):
+        if pivoting not in self.PIVOTING_STRATEGIES:
+            raise ValueError(self.UNKNOWN_PIVOTING_MSG)
+
+        system = self.working_copy()
+        if pivoting is self.NO_PIVOTING:
+            system.eliminate_without_pivoting()
+        else:
+            system.eliminate_with_pivoting(pivoting)
+        return system
+
+    def eliminate_without_pivoting(self):
+        row = 0
+        for col in range(0, self.dimension, 1):
+            if row == len(self):
+                break
 
-        current_index = 0
-        dimensions = system[0].dimension
-        for i in range(0, len(system), 1):
-            coefficient = MyDecimal(system[i][current_index])
+            coefficient = MyDecimal(self[row][col])
             if coefficient.is_near_zero():              # If this row is unsuitable for triangular form
-                for j in range(i+1, len(system), 1):    # Search the rows below for a non-zero index in this position
-                    if system[j][current_index] != 0:
-                        system.swap_rows(i, j)
+                for j in range(row+1, len(self), 1):    # Search the rows below for a non-zero index in this position
+                    if not MyDecimal(self[j][col]).is_near_zero():
+                        self.swap_rows(row, j)
                         break
-            system.clear_rows_below(current_index, i)
-            current_index += 1
-            if current_index == dimensions:
+                else:
+                    continue                            # Free variable, try the next column with the same row
+            self.clear_rows_below(col, row)
+            row += 1
+
+    def eliminate_with_pivoting(self, pivoting):
+        # Largest available pivot at every step. Rows are swapped for every strategy, columns only for rook and
+        # complete pivoting (tracked in column_permutation). Also records the growth factor, the largest entry
+        # met during elimination over the largest entry of the input, the pivot ratio between the largest and
+        # the smallest pivot magnitudes, and for square nonsingular systems an estimate of the 1-norm condition
+        # number computed from the factors P A Q = L U (see estimate_condition_number).
+        initial_largest = self.largest_magnitude(0, 0)
+        largest = initial_largest
+        norm = self.one_norm()
+        pivots = []
+
+        lower = [[] for _ in range(len(self))]      # lower[i] holds the multipliers of row i, swapped with it
+        row_order = list(range(len(self)))          # row_order[i] is the original equation now in row i
+
+        row = 0
+        for col in range(self.dimension):
+            if row == len(self):
                 break
 
-        return system
+            pivot_row, pivot_col = self.choose_pivot(row, col, pivoting)
+            if MyDecimal(self[pivot_row][pivot_col]).is_near_zero():
+                if pivoting == self.PARTIAL_PIVOTING:
+                    continue                            # Free variable, try the next column with the same row
+                break                                   # The whole remaining block is zero
+
+            self.swap_rows(row, pivot_row)
+            lower[row], lower[pivot_row] = lower[pivot_row], lower[row]
+            row_order[row], row_order[pivot_row] = row_order[pivot_row], row_order[row]
+            self.swap_columns(col, pivot_col)
+            pivots.append(abs(self[row][col]))
+
+            for i in range(row + 1, len(self)):        # The multipliers clear_rows_below is about to apply
+                coefficient = self[i][col]
+                lower[i].append(Decimal(0) if MyDecimal(coefficient).is_near_zero() else coefficient / self[row][col])
+            self.clear_rows_below(col, row)
+            largest = max(largest, self.largest_magnitude(row + 1, col + 1))
+            row += 1
+
+        self.growth_factor = largest / initial_largest if initial_largest else Decimal(1)
+        self.pivot_ratio = max(pivots) / min(pivots) if pivots else None
+        if len(self) == self.dimension == len(pivots):
+            self.condition_estimate = norm * self.estimate_inverse_norm(lower, row_order)
+
+    def one_norm(self):
+        # Largest absolute column sum, the matrix norm induced by the vector 1-norm
+        return max(sum(abs(p[j]) for p in self.planes) for j in range(self.dimension))
+
+    def solve_with_factors(self, lower, row_order, b, transposed=False):
+        # Solves A x = b, or A^T x = b when transposed, with the factors P A Q = L U of a square system left by
+        # eliminate_with_pivoting: L is unit lower triangular with the multipliers below its diagonal, U is the
+        # upper triangle of the rows, P is given by row_order and Q by column_permutation.
+        n = self.dimension
+        u = [[self[i][j] for j in range(n)] for i in range(n)]
+
+        if not transposed:
+            # L U (Q^T x) = P b
+            y = [b[row_order[i]] for i in range(n)]
+            for i in range(n):
+                y[i] -= sum(lower[i][j] * y[j] for j in range(i))
+            for i in range(n - 1, -1, -1):
+                y[i] = (y[i] - sum(u[i][j] * y[j] for j in range(i + 1, n))) / u[i][i]
+            return self.original_order(y)
+
+        # U^T L^T (P x) = Q^T b
+        y = [b[variable] for variable in self.column_permutation]
+        for i in range(n):
+            y[i] = (y[i] - sum(u[j][i] * y[j] for j in range(i))) / u[i][i]
+        for i in range(n - 1, -1, -1):
+            y[i] -= sum(lower[j][i] * y[j] for j in range(i + 1, n))
+        x = [Decimal(0)] * n
+        for i, equation in enumerate(row_order):
+            x[equation] = y[i]
+        return x
+
+    def estimate_inverse_norm(self, lower, row_order, max_iterations=5):
+        # Hager's estimator of ||A^-1||_1 with Higham's safeguards (LAPACK xLACON): a few solves with A and A^T
+        # instead of forming the inverse. It is a lower bound, almost always within a factor of 3.
+        n = self.dimension
+        x = [Decimal(1) / n] * n
+        estimate = Decimal(0)
+        for iteration in range(max_iterations):
+            y = self.solve_with_factors(lower, row_order, x)
+            new_estimate = sum(abs(value) for value in y)
+            if iteration and new_estimate <= estimate:
+                break
+            estimate = new_estimate
+
+            z = self.solve_with_factors(lower, row_order, [Decimal(1) if value >= 0 else Decimal(-1) for value in y],
+                                        transposed=True)
+            j = max(range(n), key=lambda i: abs(z[i]))
+            if abs(z[j]) <= sum(zi * xi for zi, xi in zip(z, x)):
+                break
+            x = [Decimal(0)] * n
+            x[j] = Decimal(1)
+
+        # Higham's extra test vector, with alternating signs, catches the matrices that fool the iteration
+        alternating = [Decimal((-1) ** i) * (1 + Decimal(i) / max(n - 1, 1)) for i in range(n)]
+        y = self.solve_with_factors(lower, row_order, alternating)
+        return max(estimate, 2 * sum(abs(value) for value in y) / (3 * n))
+
+    def choose_pivot(self, row, col, pivoting):
+        rows = range(row, len(self))
+        if pivoting == self.PARTIAL_PIVOTING:
+            return max(rows, key=lambda i: abs(self[i][col])), col
+
+        cols = range(col, self.dimension)
+        pivot_row, pivot_col = max(rows, key=lambda i: abs(self[i][col])), col
+        if pivoting == self.COMPLETE_PIVOTING or MyDecimal(self[pivot_row][pivot_col]).is_near_zero():
+            return max(((i, j) for i in rows for j in cols), key=lambda ij: abs(self[ij[0]][ij[1]]))
+
+        # Rook pivoting: alternate row and column searches until the entry is the largest in both
+        while True:
+            best_col = max(cols, key=lambda j: abs(self[pivot_row][j]))
+            if abs(self[pivot_row][best_col]) <= abs(self[pivot_row][pivot_col]):
+                return pivot_row, pivot_col
+            pivot_col = best_col
+
+            best_row = max(rows, key=lambda i: abs(self[i][pivot_col]))
+            if abs(self[best_row][pivot_col]) <= abs(self[pivot_row][pivot_col]):
+                return pivot_row, pivot_col
+            pivot_row = best_row
+
+    def largest_magnitude(self, first_row, first_col):
+        return max([abs(self[i][j]) for i in range(first_row, len(self)) for j in range(first_col, self.dimension)]
+                   or [Decimal(0)])
+
+    def original_order(self, coordinates):
+        # Undo the column swaps on a vector of coordinates given in column order
+        ordered = [Decimal(0)] * self.dimension
+        for position, variable in enumerate(self.column_permutation):
+            ordered[variable] = coordinates[position]
+        return ordered
 
     def clear_rows_below(self, index, row):
         for i in range(row + 1, len(self), 1):                              # For each row below the reference one
@@ -94,8 +278,8 @@ class LinearSystem(object):
 
                 self.add_multiple_times_row_to_row(factor, row, i)
 
-    def compute_rref(self):
-        tf = self.compute_triangular_form()
+    def compute_rref(self, pivoting=NO_PIVOTING):
+        tf = self.compute_triangular_form(pivoting)
 
         nonzeros = tf.indices_of_first_nonzero_terms_in_each_row()
 
@@ -109,18 +293,21 @@ class LinearSystem(object):
 
         return tf
 
-    def solve(self):
-        rref = self.compute_rref()
+    def solve(self, pivoting=NO_PIVOTING):
+        rref = self.compute_rref(pivoting)
+        self.growth_factor = rref.growth_factor
+        self.pivot_ratio = rref.pivot_ratio
+        self.condition_estimate = rref.condition_estimate
 
         has_no_solution = False
         valid_equations = 0
         dimensions = rref[0].dimension
-        solution = []
+        solution = [Decimal(0)] * dimensions
         nonzeros = rref.indices_of_first_nonzero_terms_in_each_row()
 
         for i in range(0, len(nonzeros), 1):
             if nonzeros[i] != -1:
-                solution.insert(nonzeros[i], rref[i].constant_term)
+                solution[nonzeros[i]] = rref[i].constant_term
                 valid_equations += 1
             elif not MyDecimal(rref[i].constant_term).is_near_zero():
                 has_no_solution = True
@@ -129,71 +316,48 @@ class LinearSystem(object):
         if has_no_solution:
             return None
         elif valid_equations < dimensions:
-            return self.parametrized_solve()
+            return self.parametrized_solve(pivoting)
         else:
-            return Vector(solution)
+            return Vector(rref.original_order(solution))
 
     # Used only when system has infinite solutions, reproduces manual approach of solving the parametrization
     # This method should be modularized into smaller components, but it's late and I want to sleep :D
-    def parametrized_solve(self):
-        rref = self.compute_rref()
+    def parametrized_solve(self, pivoting=NO_PIVOTING):
+        rref = self.compute_rref(pivoting)
         total_dimensions = rref[0].dimension
-        intermediate_vectors = []
         nonzeros = rref.indices_of_first_nonzero_terms_in_each_row()
 
-        # First I create a set of equations equal to the original ones but "solving" for the pivot variable
-        #   note: I only reproduce the right side of the equation in a Vector
-        #   e.g.
-        #   x + y +  z = 1   =>   x = 1 -  y -  z   => [1, -1, -1]
-        #       y - 2z = 2   =>   y = 2 + 0y + 2z   => [2, 0, 2]
-        for i in range(0, len(rref), 1):                        # For every equation
-            nonzero_for_eq = nonzeros[i]
-            if nonzero_for_eq != -1:                            # If it is a valid equation
-                int_vector = [rref[i].constant_term]            # Append the constant term at the start of our vector
-                for j in range(1, total_dimensions, 1):         # Skip x as x will never be a free variable
-                    if j != nonzero_for_eq:                     # Subtract the corresponding coefficient unless it is
-                                                                # the coefficient for the pivot variable being evaluated
-                        int_vector.append(rref[i][j] * -1)
-                    else:
-                        int_vector.append(0)                    # If it is the pivot variable then append a 0
-                intermediate_vectors.append(int_vector)
-
-        # Now I add equations for the free variables and "missing equations" (i.e. eqs in 0 = 0 form)
-        last_nonzero_index = -1
-        current_equation = 0
-        true_results = []
-        for i in range(0, len(nonzeros), 1):
-            if i < total_dimensions:
-                while nonzeros[i] > last_nonzero_index + 1:                 # There might be several missing pivots
-                    free_variable_vector = [0] * total_dimensions
-                    free_variable_vector[i] = 1
-                    true_results.append(free_variable_vector)
-                    last_nonzero_index += 1
-
-                if nonzeros[i] == -1:
-                    free_variable_vector = [0] * total_dimensions
-                    free_variable_vector[i] = 1
-                    true_results.append(free_variable_vector)
-                else:
-                    true_results.append(intermediate_vectors[current_equation])
+        pivot_rows = dict((nonzeros[i], i) for i in range(0, len(rref), 1) if nonzeros[i] != -1)
+        free_variables = [j for j in range(0, total_dimensions, 1) if j not in pivot_rows]
 
-                current_equation += 1
-                last_nonzero_index = nonzeros[i]
+        # Every variable is written as its constant followed by its coefficient for each free variable
+        #   note: the constant is kept apart from the variable coefficients, so any variable (x included) can be free
+        #   e.g. with z as the only free variable
+        #   x      +  z = 1   =>   x = 1 -  z   => [1, -1]
+        #       y - 2z = 2   =>   y = 2 + 2z   => [2, 2]
+        #                         z = 0 +  z   => [0, 1]
+        true_results = []
+        for variable in range(0, total_dimensions, 1):
+            if variable in pivot_rows:                          # Pivot variable: solve its equation for it
+                equation = rref[pivot_rows[variable]]
+                true_results.append([equation.constant_term] + [equation[f] * -1 for f in free_variables])
+            else:                                               # Free variable: equal to its own parameter
+                true_results.append([0] + [1 if f == variable else 0 for f in free_variables])
 
         # Create the "verticals" from the solution (grab all constants and
-        # coefficients for each variable in the same vector)
+        # coefficients for each free variable in the same vector)
         verticals = []
-        for i in range(0, total_dimensions, 1):
+        for i in range(0, len(free_variables) + 1, 1):
             vertical = []
             for j in range(0, len(true_results), 1):
                 value = 0
                 if not MyDecimal(true_results[j][i]).is_near_zero():
                     value = true_results[j][i]
                 vertical.append(Decimal(value))
-            verticals.append(Vector(vertical))
+            verticals.append(Vector(rref.original_order(vertical)))
 
-        # Construct final Parametrization object with the vectors we produced
-        return Parametrization(verticals[0], verticals[1:])
+        # Construct final Parametrization object with the vectors we produced, back in the original variable order
+        return Parametrization(verticals[0], verticals[1:], rref.column_permutation)
 
     def __len__(self):
         return len(self.planes)
@@ -226,13 +390,21 @@ class Parametrization(object):
     BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM = (
         'The basepoint and direction vectors should all live in the same '
         'dimension')
+    PARAMETERS_MUST_MATCH_FREE_VARIABLES = 'There must be one parameter per direction vector'
+    POINTS_MUST_BE_IN_SAME_DIM = 'Points should live in the same dimension as the parametrization'
 
-    def __init__(self, basepoint, direction_vectors):
+    def __init__(self, basepoint, direction_vectors, column_permutation=None):
 
         self.basepoint = basepoint
         self.direction_vectors = direction_vectors
         self.dimension = self.basepoint.dimension
 
+        # Variable order used while eliminating (see LinearSystem.column_permutation). The basepoint and direction
+        # vectors are always given in the original variable order.
+        if column_permutation is None:
+            column_permutation = list(range(self.dimension))
+        self.column_permutation = list(column_permutation)
+
         try:
             for v in direction_vectors:
                 assert v.dimension == self.dimension
@@ -240,6 +412,66 @@ class Parametrization(object):
         except AssertionError:
             raise Exception(self.BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM)
 
+        self._basepoint_array = None
+        self._directions = None
+        self._subspace = None
+
+    def basepoint_array(self):
+        if self._basepoint_array is None:
+            import numpy as np
+            self._basepoint_array = np.array([float(x) for x in self.basepoint.coordinates])
+        return self._basepoint_array
+
+    def direction_matrix(self):
+        # One row per direction vector, shape (k, n)
+        if self._directions is None:
+            import numpy as np
+            self._directions = np.array([[float(x) for x in v.coordinates] for v in self.direction_vectors]).reshape(
+                len(self.direction_vectors), self.dimension)
+        return self._directions
+
+    def subspace(self):
+        # Span of the direction vectors, orthonormalized once and reused by every query
+        if self._subspace is None:
+            from subspace import Subspace
+            self._subspace = Subspace(self.direction_matrix(), dimension=self.dimension)
+        return self._subspace
+
+    def orthonormal_basis(self):
+        return self.subspace().basis
+
+    def evaluate(self, parameters):
+        # parameters: one row of free variable values (t_1 .. t_k) per point to produce. With a single free
+        # variable a flat list is read as a batch of values of t_1.
+        import numpy as np
+        t = np.asarray(parameters, dtype=float)
+        if t.ndim == 1 and len(self.direction_vectors) == 1:
+            t = t.reshape(-1, 1)
+        t = np.atleast_2d(t)
+        if t.shape[1] != len(self.direction_vectors):
+            raise ValueError(self.PARAMETERS_MUST_MATCH_FREE_VARIABLES)
+        return self.basepoint_array() + t.dot(self.direction_matrix())
+
+    def project(self, points):
+        p = self._points_as_array(points)
+        b = self.basepoint_array()
+        return b + self.subspace().project(p - b)
+
+    def distance(self, points):
+        import numpy as np
+        p = self._points_as_array(points)
+        return np.sqrt(np.sum((p - self.project(p)) ** 2, axis=1))
+
+    def contains(self, points, tolerance=1e-10):
+        return self.distance(points) <= tolerance
+
+    def _points_as_array(self, points):
+        import numpy as np
+        p = np.atleast_2d(np.asarray(points, dtype=float))
+        if p.shape[1] != self.dimension:
+            raise ValueError(self.POINTS_MUST_BE_IN_SAME_DIM)
+        return p
+
     def __str__(self):
 
         output = ''
@@ -253,23 +485,31 @@ class Parametrization(object):
         return output
 
 
-p1 = Plane(normal_vector=Vector([0.786, 0.786, 0.588]), constant_term=-0.714)
-p2 = Plane(normal_vector=Vector([-0.131, -0.131, 0.244]), constant_term=0.319)
-s = LinearSystem([p1, p2])
-r = s.parametrized_solve()
-print r
-
-p1 = Plane(normal_vector=Vector([8.631, 5.112, -1.816]), constant_term=-5.113)
-p2 = Plane(normal_vector=Vector([4.315, 11.132, -5.27]), constant_term=-6.775)
-p3 = Plane(normal_vector=Vector([-2.158, 3.01, -1.727]), constant_term=-0.831)
-s = LinearSystem([p1, p2, p3])
-r = s.parametrized_solve()
-print r
-
-p1 = Plane(normal_vector=Vector([0.935, 1.76, -9.365]), constant_term=-9.955)
-p2 = Plane(normal_vector=Vector([0.187, 0.352, -1.873]), constant_term=-1.991)
-p3 = Plane(normal_vector=Vector([0.374, 0.704, -3.746]), constant_term=-3.982)
-p4 = Plane(normal_vector=Vector([-0.561, -1.056, 5.619]), constant_term=5.973)
-s = LinearSystem([p1, p2, p3, p4])
-r = s.parametrized_solve()
-print r
+
+def main():
+    getcontext().prec = 30
+
+    p1 = Plane(normal_vector=Vector([0.786, 0.786, 0.588]), constant_term=-0.714)
+    p2 = Plane(normal_vector=Vector([-0.131, -0.131, 0.244]), constant_term=0.319)
+    s = LinearSystem([p1, p2])
+    r = s.parametrized_solve()
+    print r
+
+    p1 = Plane(normal_vector=Vector([8.631, 5.112, -1.816]), constant_term=-5.113)
+    p2 = Plane(normal_vector=Vector([4.315, 11.132, -5.27]), constant_term=-6.775)
+    p3 = Plane(normal_vector=Vector([-2.158, 3.01, -1.727]), constant_term=-0.831)
+    s = LinearSystem([p1, p2, p3])
+    r = s.parametrized_solve()
+    print r
+
+    p1 = Plane(normal_vector=Vector([0.935, 1.76, -9.365]), constant_term=-9.955)
+    p2 = Plane(normal_vector=Vector([0.187, 0.352, -1.873]), constant_term=-1.991)
+    p3 = Plane(normal_vector=Vector([0.374, 0.704, -3.746]), constant_term=-3.982)
+    p4 = Plane(normal_vector=Vector([-0.561, -1.056, 5.619]), constant_term=5.973)
+    s = LinearSystem([p1, p2, p3, p4])
+    r = s.parametrized_solve()
+    print r
+
+
+if __name__ == "__main__":
+    main()
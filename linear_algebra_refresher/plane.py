@@ -2,8 +2,6 @@ from decimal import Decimal, getcontext
 
 from vector import Vector
 
-getcontext().prec = 30
-
 
 class Plane(object):
 
@@ -21,27 +19,40 @@ class Plane(object):
             constant_term = Decimal('0')
         self.constant_term = Decimal(constant_term)
 
-        self.basepoint = None
-        self.set_basepoint()
+        self.reset_basepoint()
+
+    @property
+    def basepoint(self):
+        # Computed on first use, most of the planes built while eliminating never need one
+        if not self._basepoint_is_set:
+            self.set_basepoint()
+        return self._basepoint
+
+    def reset_basepoint(self):
+        # To be called after updating the normal vector or the constant term in place
+        self._basepoint = None
+        self._basepoint_is_set = False
 
     def set_basepoint(self):
         try:
             n = self.normal_vector
             c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
+            basepoint_coords = [Decimal(0)]*self.dimension
 
             initial_index = Plane.first_nonzero_index(n.coordinates)
             initial_coefficient = n[initial_index]
 
             basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+            self._basepoint = Vector.from_decimals(basepoint_coords)
 
         except Exception as e:
             if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
+                self._basepoint = None
             else:
                 raise e
 
+        self._basepoint_is_set = True
+
     def __str__(self):
 
         num_decimal_places = 3
@@ -115,6 +126,104 @@ class Plane(object):
 
         return n1.is_parallel_to(n2)
 
+    @staticmethod
+    def intersect_pairs(planes, others=None, region=None, cells=None, tolerance=1e-10):
+        # Intersects every pair of planes (i < j) or, when others is given, every plane against every other plane.
+        # Parallel and coincident pairs are skipped. region = (lower_corner, upper_corner) keeps only the lines
+        # that pass through the box; only planes crossing a common cell of a cells^3 grid over the box are paired.
+        # Returns (i, j, points, directions): every intersection line is points[p] + t * directions[p], with
+        # points[p] the point of the line closest to the origin.
+        import numpy as np
+        import spatial
+
+        normals, constants = spatial.normals_and_constants(planes, 3)
+        other_normals, other_constants = normals, constants
+        if others is not None:
+            other_normals, other_constants = spatial.normals_and_constants(others, 3)
+        if region is not None and cells is None:
+            cells = spatial.default_cells(len(planes) + len(others or []), 3)
+
+        blocks = []
+        for i, j, cell in spatial.candidate_pair_blocks(normals, constants,
+                                                        None if others is None else other_normals,
+                                                        None if others is None else other_constants,
+                                                        region, cells):
+            n1, n2 = normals[i], other_normals[j]
+            k1, k2 = constants[i], other_constants[j]
+            directions = np.cross(n1, n2)
+            squared_norms = np.sum(directions ** 2, axis=1)
+
+            keep = squared_norms > tolerance ** 2               # Nearly parallel pairs that hashed apart
+            n1, n2, k1, k2, directions, squared_norms = (n1[keep], n2[keep], k1[keep], k2[keep], directions[keep],
+                                                         squared_norms[keep])
+            i, j = i[keep], j[keep]
+
+            # Closest point to the origin: ((k1 n2 - k2 n1) x (n1 x n2)) / |n1 x n2|^2
+            points = (np.cross(k1[:, np.newaxis] * n2 - k2[:, np.newaxis] * n1, directions) /
+                      squared_norms[:, np.newaxis])
+
+            if region is not None:
+                keep = spatial.line_crosses_region(points, directions, region)
+                points, directions, i, j = points[keep], directions[keep], i[keep], j[keep]
+
+            blocks.append((i, j, points, directions))
+
+        empty = (np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros((0, 3)), np.zeros((0, 3)))
+        i, j, points, directions = spatial.concatenate_blocks(blocks, empty)
+
+        if region is not None:                                  # A line is met again in every cell it crosses
+            _, first = np.unique(i * len(other_normals) + j, return_index=True)
+            first = np.sort(first)
+            i, j, points, directions = i[first], j[first], points[first], directions[first]
+
+        return i, j, points, directions
+
+    @staticmethod
+    def intersect_triples(planes, triples=None, region=None, cells=None, tolerance=1e-10):
+        # Intersects triples of planes down to a single point. triples is an (t, 3) array of plane indices; when it
+        # is not given every combination i < j < k of planes in three different directions is generated in blocks,
+        # and with a region = (lower_corner, upper_corner) only among the planes crossing a common cell of a
+        # cells^3 grid over the box. Triples with two parallel planes or three planes sharing a line are skipped
+        # and with a region only the points inside the box are kept. Returns (triples, points) with one row of
+        # each per intersection point.
+        import numpy as np
+        import spatial
+
+        normals, constants = spatial.normals_and_constants(planes, 3)
+        if triples is None:
+            if region is not None and cells is None:
+                cells = spatial.default_cells(len(planes), 3)
+            candidates = spatial.candidate_triple_blocks(normals, constants, region, cells)
+        else:
+            triples = np.asarray(triples, dtype=int).reshape(-1, 3)
+            g = spatial.direction_groups(normals)[triples]
+            keep = ((g != -1).all(axis=1) & (g[:, 0] != g[:, 1]) & (g[:, 0] != g[:, 2]) & (g[:, 1] != g[:, 2]))
+            candidates = [(triples[keep], None)]
+
+        blocks = []
+        for triples, cell in candidates:
+            n1, n2, n3 = normals[triples[:, 0]], normals[triples[:, 1]], normals[triples[:, 2]]
+            k1, k2, k3 = constants[triples[:, 0]], constants[triples[:, 1]], constants[triples[:, 2]]
+            n2_x_n3 = np.cross(n2, n3)
+            n3_x_n1 = np.cross(n3, n1)
+            n1_x_n2 = np.cross(n1, n2)
+            determinant = np.sum(n1 * n2_x_n3, axis=1)
+
+            keep = np.abs(determinant) > tolerance
+            points = ((k1[:, np.newaxis] * n2_x_n3 + k2[:, np.newaxis] * n3_x_n1 + k3[:, np.newaxis] * n1_x_n2)[keep] /
+                      determinant[keep][:, np.newaxis])
+            triples = triples[keep]
+
+            if region is not None:
+                keep = spatial.inside_region(points, region)
+                if cell is not None:                            # Each point is reported by the cell owning it
+                    keep[keep] = spatial.cell_of_points(points[keep], region, cells) == cell
+                points, triples = points[keep], triples[keep]
+
+            blocks.append((triples, points))
+
+        return spatial.concatenate_blocks(blocks, (np.zeros((0, 3), dtype=int), np.zeros((0, 3))))
+
     @staticmethod
     def first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
@@ -129,6 +238,8 @@ class MyDecimal(Decimal):
 
 
 def main():
+    getcontext().prec = 30
+
     first = Vector([-0.412, 3.806, 0.728])
     k1 = -3.46
     second = Vector([1.03, -9.515, -1.82])
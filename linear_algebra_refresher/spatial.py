@@ -0,0 +1,213 @@
+from itertools import product
+
+import numpy as np
+
+BLOCK_SIZE = 1 << 18        # Candidate index pairs materialized at a time
+MAX_CELLS = 4096            # Upper bound on the number of grid cells used for a region
+
+
+def normals_and_constants(items, dimension):
+    # Float arrays for a list of Line / Plane objects: normals (m, d) and constant terms (m,)
+    normals = np.array([[float(x) for x in item.normal_vector.coordinates] for item in items]).reshape(
+        len(items), dimension)
+    constants = np.array([float(item.constant_term) for item in items], dtype=float)
+    return normals, constants
+
+
+def direction_groups(normals, decimals=9, tolerance=1e-10):
+    # Hash every normal by its direction so that parallel objects share a group id.
+    # Zero normals get the group -1 and never take part in an intersection.
+    magnitudes = np.sqrt(np.sum(normals ** 2, axis=1))
+    nonzero = magnitudes > tolerance
+    groups = np.full(len(normals), -1, dtype=int)
+    if not nonzero.any():
+        return groups
+
+    units = normals[nonzero] / magnitudes[nonzero][:, np.newaxis]
+    # Flip signs so that n and -n hash the same: the first non negligible coordinate is made positive
+    leading = np.argmax(np.abs(units) > tolerance, axis=1)
+    signs = np.sign(units[np.arange(len(units)), leading])
+    keys = np.round(units * signs[:, np.newaxis], decimals) + 0.0      # + 0.0 turns -0.0 into 0.0
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    groups[nonzero] = inverse
+    return groups
+
+
+def shared_direction_groups(normals, other_normals):
+    # Group ids of two sets hashed together, so that equal ids mean parallel across the sets as well
+    groups = direction_groups(np.vstack((normals, other_normals)))
+    return groups[:len(normals)], groups[len(normals):]
+
+
+def candidate_pair_blocks(normals, constants, other_normals=None, other_constants=None, region=None, cells=None,
+                          block_size=BLOCK_SIZE):
+    # Non parallel pairs (i, j), either i < j within one set or set a against set b, yielded as (i, j, cell) blocks
+    # of at most about block_size pairs so that the m * n index arrays are never built at once.
+    # Without a region every pair is a candidate and cell is None. With a region = (lower_corner, upper_corner)
+    # the box is split into a cells^d grid, every object is bucketed by the cells it crosses and only objects
+    # sharing a cell are paired; the caller keeps a result only in the cell that owns it (see cell_of_points).
+    if other_normals is None:
+        groups = direction_groups(normals)
+        other_groups = groups
+    else:
+        groups, other_groups = shared_direction_groups(normals, other_normals)
+
+    if region is None:
+        other_members = None if other_normals is None else np.arange(len(other_normals))
+        for i, j in _pair_blocks(np.arange(len(normals)), groups, other_members, other_groups, block_size):
+            yield i, j, None
+        return
+
+    if cells is None:
+        cells = default_cells(len(normals) + (0 if other_normals is None else len(other_normals)), normals.shape[1])
+
+    buckets = cell_members(*cell_incidence(normals, constants, region, cells))
+    if other_normals is None:
+        for cell, members in buckets:
+            for i, j in _pair_blocks(members, groups, None, groups, block_size):
+                yield i, j, cell
+    else:
+        other_buckets = dict(cell_members(*cell_incidence(other_normals, other_constants, region, cells)))
+        for cell, members in buckets:
+            if cell in other_buckets:
+                for i, j in _pair_blocks(members, groups, other_buckets[cell], other_groups, block_size):
+                    yield i, j, cell
+
+
+def candidate_triple_blocks(normals, constants, region=None, cells=None, block_size=BLOCK_SIZE):
+    # Index triples (i, j, k), i < j < k, of objects in three different direction groups, yielded as
+    # (triples, cell) blocks. The region and cells work as in candidate_pair_blocks.
+    groups = direction_groups(normals)
+    if region is None:
+        for triples in _triple_blocks(np.arange(len(normals)), groups, block_size):
+            yield triples, None
+        return
+
+    if cells is None:
+        cells = default_cells(len(normals), normals.shape[1])
+    for cell, members in cell_members(*cell_incidence(normals, constants, region, cells)):
+        for triples in _triple_blocks(members, groups, block_size):
+            yield triples, cell
+
+
+def _pair_blocks(members, groups, other_members, other_groups, block_size):
+    # Pairs of members (i < j in members order when other_members is None) in blocks of whole rows
+    count = len(members) if other_members is None else len(other_members)
+    rows = max(1, block_size // max(count, 1))
+    columns = np.arange(count)
+    for start in range(0, len(members), rows):
+        a, b = np.meshgrid(np.arange(start, min(start + rows, len(members))), columns, indexing='ij')
+        a, b = a.ravel(), b.ravel()
+        if other_members is None:
+            ordered = b > a
+            i, j = members[a[ordered]], members[b[ordered]]
+        else:
+            i, j = members[a], other_members[b]
+
+        g_i, g_j = groups[i], other_groups[j]
+        keep = (g_i != g_j) & (g_i != -1) & (g_j != -1)
+        if keep.any():
+            yield i[keep], j[keep]
+
+
+def _triple_blocks(members, groups, block_size):
+    # For every first member i, the non parallel pairs (j, k) of later members not parallel to i
+    for position in range(len(members) - 2):
+        i = members[position]
+        if groups[i] == -1:
+            continue
+        rest = members[position + 1:]
+        rest = rest[groups[rest] != groups[i]]
+        for j, k in _pair_blocks(rest, groups, None, groups, block_size):
+            yield np.column_stack((np.full(len(j), i, dtype=int), j, k))
+
+
+def default_cells(count, dimension):
+    # About count^(1/d) cells per axis, at most MAX_CELLS cells in total
+    cap = int(round(MAX_CELLS ** (1.0 / dimension)))
+    return max(1, min(cap, int(round(count ** (1.0 / dimension)))))
+
+
+def cell_incidence(normals, constants, region, cells, tolerance=1e-10):
+    # (objects, cells) index arrays, one entry per grid cell crossed by each hyperplane n.x = k inside the region.
+    # The grid is walked column by column over the first d - 1 axes; within a column the hyperplane covers an
+    # interval of the last axis, which gives a contiguous run of cells.
+    lower, upper = (np.asarray(corner, dtype=float) for corner in region)
+    dimension = len(lower)
+    size = (upper - lower) / cells
+    pad = size * 1e-9                                   # Cells overlap slightly so rounding never loses a crossing
+    rest, last = normals[:, :-1], normals[:, -1]
+    sloped = np.abs(last) > tolerance
+
+    objects, cell_ids = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)]
+    for column, index in enumerate(product(range(cells), repeat=dimension - 1)):
+        column_lower = lower[:-1] + np.array(index) * size[:-1] - pad[:-1]
+        column_upper = column_lower + size[:-1] + 2 * pad[:-1]
+        low = np.minimum(rest * column_lower, rest * column_upper).sum(axis=1)
+        high = np.maximum(rest * column_lower, rest * column_upper).sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            end_a, end_b = (constants - low) / last, (constants - high) / last
+        start = np.maximum(np.where(sloped, np.minimum(end_a, end_b), lower[-1]) - pad[-1], lower[-1])
+        stop = np.minimum(np.where(sloped, np.maximum(end_a, end_b), upper[-1]) + pad[-1], upper[-1])
+        crossing = np.where(sloped, True, (low <= constants) & (constants <= high)) & (start <= stop)
+
+        members = np.flatnonzero(crossing)
+        first = np.clip(np.floor((start[crossing] - lower[-1]) / size[-1]), 0, cells - 1).astype(int)
+        last_cell = np.clip(np.floor((stop[crossing] - lower[-1]) / size[-1]), 0, cells - 1).astype(int)
+        counts = last_cell - first + 1
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        objects.append(np.repeat(members, counts))
+        cell_ids.append(column * cells + np.repeat(first, counts) + offsets)
+
+    return np.concatenate(objects), np.concatenate(cell_ids)
+
+
+def cell_members(objects, cell_ids):
+    # [(cell, members)] for every non empty cell, members sorted by object index
+    order = np.lexsort((objects, cell_ids))
+    objects, cell_ids = objects[order], cell_ids[order]
+    boundaries = np.flatnonzero(np.diff(cell_ids)) + 1
+    return [(int(cell_ids[start]), objects[start:stop])
+            for start, stop in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(objects)])))
+            if stop > start]
+
+
+def cell_of_points(points, region, cells):
+    # Grid cell of every point, numbered like cell_incidence (last axis fastest)
+    lower, upper = (np.asarray(corner, dtype=float) for corner in region)
+    index = np.clip(np.floor((points - lower) / ((upper - lower) / cells)), 0, cells - 1).astype(int)
+    return np.ravel_multi_index(index.T, (cells,) * len(lower))
+
+
+def concatenate_blocks(blocks, empty):
+    # Joins the per block result arrays, or returns empty when no block produced anything
+    if not blocks:
+        return empty
+    return tuple(np.concatenate(parts) for parts in zip(*blocks))
+
+
+def crosses_region(normals, constants, region):
+    # True for every hyperplane n.x = k that passes through the box region = (lower_corner, upper_corner)
+    lower, upper = (np.asarray(corner, dtype=float) for corner in region)
+    low_values = np.minimum(normals * lower, normals * upper).sum(axis=1)
+    high_values = np.maximum(normals * lower, normals * upper).sum(axis=1)
+    return (low_values <= constants) & (constants <= high_values)
+
+
+def line_crosses_region(points, directions, region, tolerance=1e-10):
+    # Slab test: True for every parametric line p + t d that passes through the box region
+    lower, upper = (np.asarray(corner, dtype=float) for corner in region)
+    moving = np.abs(directions) > tolerance
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (lower - points) / directions
+        t2 = (upper - points) / directions
+    t_enter = np.where(moving, np.minimum(t1, t2), -np.inf).max(axis=1)
+    t_exit = np.where(moving, np.maximum(t1, t2), np.inf).min(axis=1)
+    still_inside = np.where(moving, True, (lower <= points) & (points <= upper)).all(axis=1)
+    return still_inside & (t_enter <= t_exit)
+
+
+def inside_region(points, region):
+    lower, upper = (np.asarray(corner, dtype=float) for corner in region)
+    return ((lower <= points) & (points <= upper)).all(axis=1)
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class Subspace(object):
+
+    VECTORS_MUST_BE_IN_SAME_DIM_MSG = 'All vectors should live in the same dimension as the subspace'
+    CANNOT_INFER_DIMENSION_MSG = 'The dimension must be given when building a subspace without vectors'
+
+    def __init__(self, vectors, dimension=None, tolerance=1e-10):
+        # vectors: a list of Vector objects or an (k, n) array, one spanning vector per row
+        rows = Subspace.as_array(vectors)
+        if dimension is None:
+            if rows.shape[0] == 0:
+                raise ValueError(self.CANNOT_INFER_DIMENSION_MSG)
+            dimension = rows.shape[1]
+
+        self.dimension = dimension
+        self.tolerance = tolerance
+        self.basis = np.zeros((0, dimension))       # Orthonormal rows, shape (rank, n)
+        self._projector = None
+        self.extend(rows)
+
+    @property
+    def rank(self):
+        return self.basis.shape[0]
+
+    @property
+    def projector(self):
+        # Orthogonal projection matrix Q^T Q, built once so that projecting a batch is a single product
+        if self._projector is None:
+            self._projector = self.basis.T.dot(self.basis)
+        return self._projector
+
+    def extend(self, vectors):
+        # Modified Gram-Schmidt against the cached basis. Every candidate is orthogonalized twice
+        # ("twice is enough") so the basis stays orthonormal to working precision.
+        # Returns the number of vectors that turned out to be linearly independent.
+        rows = self._checked(vectors)
+        added = 0
+        for v in rows:
+            scale = np.sqrt(np.dot(v, v))
+            if scale <= self.tolerance:
+                continue
+            for _ in range(2):
+                for q in self.basis:
+                    v = v - np.dot(v, q) * q
+            magnitude = np.sqrt(np.dot(v, v))
+            if magnitude <= self.tolerance * max(scale, 1.0):
+                continue
+            self.basis = np.vstack((self.basis, v / magnitude))
+            added += 1
+
+        if added:
+            self._projector = None
+        return added
+
+    def coordinates(self, vectors):
+        # Coordinates of the projections in terms of the orthonormal basis, shape (N, rank)
+        return self._checked(vectors).dot(self.basis.T)
+
+    def project(self, vectors):
+        return self._checked(vectors).dot(self.projector)
+
+    def reject(self, vectors):
+        rows = self._checked(vectors)
+        return rows - rows.dot(self.projector)
+
+    def decompose(self, vectors):
+        # Returns (parallel, orthogonal) components, the batched form of
+        # Vector.parallel_component_to / Vector.orthogonal_component_to
+        rows = self._checked(vectors)
+        parallel = rows.dot(self.projector)
+        return parallel, rows - parallel
+
+    def contains(self, vectors, tolerance=1e-10):
+        rejected = self.reject(vectors)
+        return np.sqrt(np.sum(rejected ** 2, axis=1)) <= tolerance
+
+    def _checked(self, vectors):
+        rows = Subspace.as_array(vectors)
+        if rows.shape[0] and rows.shape[1] != self.dimension:
+            raise ValueError(self.VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+        return rows.reshape(rows.shape[0], self.dimension)
+
+    @staticmethod
+    def as_array(vectors):
+        # One row per vector. Accepts a lone Vector, a list of Vectors or coordinate lists, or an array
+        if isinstance(vectors, np.ndarray):
+            return np.atleast_2d(vectors.astype(float))
+        if hasattr(vectors, 'coordinates'):
+            vectors = [vectors]
+
+        rows = [[float(x) for x in getattr(v, 'coordinates', v)] for v in vectors]
+        if not rows:
+            return np.zeros((0, 0))
+        if any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError(Subspace.VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+        return np.array(rows)
+
+    def __str__(self):
+        return 'Subspace: rank {} in dimension {}'.format(self.rank, self.dimension)
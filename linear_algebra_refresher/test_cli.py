@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import backends
+import cli
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, 'systems.jsonl')
+        self.output = os.path.join(self.directory, 'solutions.jsonl')
+        with open(self.input, 'w') as f:
+            for n in range(25):
+                f.write(json.dumps({'id': n, 'equations': [[1, 0, 0, n], [0, 1, 0, 1], [0, 0, 1, 2]]}) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_output(self):
+        with open(self.output) as f:
+            return [json.loads(line) for line in f]
+
+    def test_workers_keep_input_order(self):
+        self.assertEqual(cli.main([self.input, '-w', '2', '--chunksize', '3', '-o', self.output]), 0)
+        results = self.read_output()
+        self.assertEqual([r['id'] for r in results], list(range(25)))
+        self.assertEqual(results[7]['solution'], [7.0, 1.0, 2.0])
+
+    def test_in_flight_chunks_are_bounded(self):
+        class RecordingPool(object):
+            def __init__(self):
+                self.submitted, self.in_flight = 0, []
+
+            def apply_async(self, function, arguments):
+                self.submitted += 1
+                self.in_flight.append(self.submitted - consumed[0])
+                result = function(*arguments)
+                return type('Result', (object,), {'get': lambda _: result})()
+
+        consumed = [0]
+        pool = RecordingPool()
+        lines = iter(open(self.input).readlines())
+        results = []
+        for result in cli.solve_in_pool(pool, 'decimal', None, lines, 2, 3):
+            results.append(json.loads(result))
+            consumed[0] = (len(results) + 1) // 2
+        self.assertEqual([r['id'] for r in results], list(range(25)))
+        self.assertEqual(pool.submitted, 13)
+        self.assertTrue(max(pool.in_flight) <= 3)
+
+    def test_rejects_invalid_arguments(self):
+        stderr, sys.stderr = sys.stderr, open(os.devnull, 'w')
+        try:
+            for arguments in (['-w', '0'], ['-w', '2', '--chunksize', '0'], ['--chunksize', '-3'],
+                              ['-b', 'float', '-p', 'complete']):
+                with self.assertRaises(SystemExit):
+                    cli.main([self.input, '-o', self.output] + arguments)
+        finally:
+            sys.stderr.close()
+            sys.stderr = stderr
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_float_backend_takes_no_pivoting(self):
+        self.assertEqual(backends.solve_with_float([[2, 4]])['solution'], [2.0])
+        with self.assertRaises(ValueError):
+            backends.solve_with_float([[2, 4]], 'partial')
+
+    def test_missing_file_fails_before_any_output(self):
+        stderr, sys.stderr = sys.stderr, open(os.devnull, 'w')
+        try:
+            status = cli.main([self.input, os.path.join(self.directory, 'missing.jsonl'), '-o', self.output])
+        finally:
+            sys.stderr.close()
+            sys.stderr = stderr
+        self.assertEqual(status, 1)
+        self.assertFalse(os.path.exists(self.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import random
+import unittest
+from itertools import combinations
+
+import numpy as np
+
+import spatial
+from vector import Vector
+from line import Line
+from plane import Plane
+
+
+def random_lines(rng, count):
+    return [Line(Vector([rng.uniform(-5, 5), rng.uniform(-5, 5)]), rng.uniform(-5, 5)) for _ in range(count)]
+
+
+def random_planes(rng, count):
+    return [Plane(Vector([rng.uniform(-5, 5) for _ in range(3)]), rng.uniform(-5, 5)) for _ in range(count)]
+
+
+def as_floats(vector):
+    return [float(x) for x in vector.coordinates]
+
+
+class LineIntersectionTest(unittest.TestCase):
+
+    def assert_matches_intersection_with(self, lines, others, i, j, points):
+        expected = {}
+        for a, first in enumerate(lines):
+            for b, second in enumerate(others):
+                result = first.intersection_with(second)
+                if isinstance(result, Vector):
+                    expected[(a, b)] = as_floats(result)
+
+        self.assertEqual(sorted(zip(i, j)), sorted(expected))
+        for a, b, point in zip(i, j, points):
+            self.assertTrue(np.allclose(point, expected[(a, b)]))
+
+    def test_many_to_many_matches_intersection_with(self):
+        rng = random.Random(27)
+        lines, others = random_lines(rng, 10), random_lines(rng, 20)
+        others.append(Line(Vector([2 * float(lines[0].normal_vector[0]), 2 * float(lines[0].normal_vector[1])]), 1))
+        i, j, points = Line.intersect_all(lines, others)
+        self.assertEqual(len(i), 10 * 21 - 1)
+        self.assert_matches_intersection_with(lines, others, i, j, points)
+
+    def test_many_to_many_with_different_directions_in_each_set(self):
+        i, j, points = Line.intersect_all([Line(Vector([1, 0]), 1)], [Line(Vector([0, 1]), 2)])
+        self.assertEqual((list(i), list(j)), ([0], [0]))
+        self.assertTrue(np.allclose(points, [[1, 2]]))
+
+    def test_all_pairs_with_region(self):
+        lines = random_lines(random.Random(3), 30)
+        i, j, points = Line.intersect_all(lines)
+        inside = (np.abs(points) <= 1).all(axis=1)
+        i_region, j_region, points_region = Line.intersect_all(lines, region=([-1, -1], [1, 1]))
+        self.assertEqual(sorted(zip(i_region, j_region)), sorted(zip(i[inside], j[inside])))
+
+    def test_grid_cells_do_not_change_results(self):
+        rng = random.Random(8)
+        lines, others = random_lines(rng, 40), random_lines(rng, 25)
+        region = ([-2, -1], [1, 3])
+        i, j, points = Line.intersect_all(lines, others)
+        inside = spatial.inside_region(points, region)
+        expected = sorted(zip(i[inside], j[inside]))
+        for cells in (1, 3, 16):
+            i_grid, j_grid, points_grid = Line.intersect_all(lines, others, region=region, cells=cells)
+            self.assertEqual(sorted(zip(i_grid, j_grid)), expected)
+
+    def test_empty_input(self):
+        for result in (Line.intersect_all([]), Line.intersect_all([], [Line(Vector([1, 0]), 1)])):
+            self.assertEqual([len(array) for array in result], [0, 0, 0])
+
+
+class PlaneIntersectionTest(unittest.TestCase):
+
+    def test_many_to_many_pairs(self):
+        i, j, points, directions = Plane.intersect_pairs([Plane(Vector([1, 0, 0]), 1)], [Plane(Vector([0, 1, 0]), 2)])
+        self.assertEqual((list(i), list(j)), ([0], [0]))
+        self.assertTrue(np.allclose(points, [[1, 2, 0]]))
+
+        rng = random.Random(5)
+        planes, others = random_planes(rng, 6), random_planes(rng, 9)
+        i, j, points, directions = Plane.intersect_pairs(planes, others)
+        self.assertEqual(len(i), 6 * 9)
+
+    def test_triples_match_every_combination(self):
+        planes = random_planes(random.Random(11), 9)
+        planes.append(Plane(planes[0].normal_vector.times_scalar(3), 1))
+        triples, points = Plane.intersect_triples(planes)
+
+        normals = np.array([as_floats(p.normal_vector) for p in planes])
+        constants = np.array([float(p.constant_term) for p in planes])
+        expected = [t for t in combinations(range(10), 3) if not (0 in t and 9 in t)]
+        self.assertEqual(sorted(map(tuple, triples)), expected)
+        self.assertTrue(np.allclose(np.sum(normals[triples] * points[:, np.newaxis, :], axis=2), constants[triples]))
+
+    def test_pairs_with_region(self):
+        planes = random_planes(random.Random(21), 25)
+        region = ([-1, -1, -1], [1, 1, 1])
+        i, j, points, directions = Plane.intersect_pairs(planes)
+        crossing = spatial.line_crosses_region(points, directions, region)
+        for cells in (None, 1, 4):
+            i_grid, j_grid, _, _ = Plane.intersect_pairs(planes, region=region, cells=cells)
+            self.assertEqual(sorted(zip(i_grid, j_grid)), sorted(zip(i[crossing], j[crossing])))
+
+    def test_triples_with_region(self):
+        planes = random_planes(random.Random(12), 14)
+        region = ([-1, -2, -1], [2, 1, 1])
+        triples, points = Plane.intersect_triples(planes)
+        inside = spatial.inside_region(points, region)
+        for cells in (None, 1, 5):
+            triples_grid, _ = Plane.intersect_triples(planes, region=region, cells=cells)
+            self.assertEqual(sorted(map(tuple, triples_grid)), sorted(map(tuple, triples[inside])))
+
+    def test_empty_input(self):
+        self.assertEqual([len(array) for array in Plane.intersect_pairs([])], [0, 0, 0, 0])
+        self.assertEqual([len(array) for array in Plane.intersect_triples([])], [0, 0])
+
+
+class CandidateBlocksTest(unittest.TestCase):
+
+    def test_small_blocks_cover_every_pair_once(self):
+        normals = np.random.RandomState(4).randn(30, 2)
+        normals[5] = 2 * normals[3]
+        constants = np.zeros(30)
+        blocks = list(spatial.candidate_pair_blocks(normals, constants, block_size=7))
+        self.assertTrue(len(blocks) > 1)
+        pairs = sorted(zip(np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])))
+        self.assertEqual(pairs, [p for p in combinations(range(30), 2) if p != (3, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import random
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from vector import Vector
+from plane import Plane
+from linsys import LinearSystem, Parametrization
+
+
+def build_system(rows):
+    return LinearSystem([Plane(normal_vector=Vector(row[:3]), constant_term=row[3]) for row in rows])
+
+
+class SolveTest(unittest.TestCase):
+
+    STRATEGIES = LinearSystem.PIVOTING_STRATEGIES
+
+    def assert_solves(self, rows, result):
+        a = np.array([row[:3] for row in rows], dtype=float)
+        k = np.array([row[3] for row in rows], dtype=float)
+        rank = np.linalg.matrix_rank(a)
+        consistent = rank == np.linalg.matrix_rank(np.column_stack((a, k)))
+
+        if not consistent:
+            self.assertIsNone(result)
+        elif rank == 3:
+            self.assertIsInstance(result, Vector)
+            self.assertTrue(np.allclose(a.dot([float(x) for x in result.coordinates]), k))
+        else:
+            self.assertIsInstance(result, Parametrization)
+            self.assertEqual(len(result.direction_vectors), 3 - rank)
+            self.assertEqual(np.linalg.matrix_rank(result.direction_matrix()), 3 - rank)
+            points = result.evaluate(np.random.randn(5, 3 - rank))
+            self.assertTrue(np.allclose(points.dot(a.T), k))
+            # Every solution of the system belongs to the parametrization
+            solution = np.linalg.lstsq(a, k, rcond=None)[0]
+            self.assertTrue(result.contains([solution], tolerance=1e-8)[0])
+
+    def test_leading_column_is_zero(self):
+        systems = [
+            [[0, 1, 1, 1], [0, 1, -1, 0]],
+            [[0, 1, 0, 2]],
+            [[0, 0, 2, 4], [0, 3, 1, 5]],
+            [[0, 0, 1, 1], [0, 0, 2, 2]],
+            [[0, 2, 0, 1], [0, 0, 0, 0], [0, 1, 3, 4]],
+        ]
+        for rows in systems:
+            for pivoting in self.STRATEGIES:
+                self.assert_solves(rows, build_system(rows).solve(pivoting))
+
+    def test_free_variable_is_reported_for_partial_pivoting(self):
+        result = build_system([[0, 1, 1, 1], [0, 1, -1, 0]]).solve(LinearSystem.PARTIAL_PIVOTING)
+        self.assertEqual(result.basepoint, Vector([0, '0.5', '0.5']))
+        self.assertEqual(result.direction_vectors, [Vector([1, 0, 0])])
+
+    def test_random_systems_against_numpy(self):
+        rng = random.Random(48)
+        for _ in range(48):
+            rows = [[rng.choice([0, 0, rng.randint(-4, 4)]) for _ in range(4)]
+                    for _ in range(rng.randint(1, 4))]
+            if not any(any(row[:3]) for row in rows):
+                continue
+            for pivoting in self.STRATEGIES:
+                self.assert_solves(rows, build_system(rows).solve(pivoting))
+
+    def test_column_swaps_are_undone(self):
+        rows = [[1, 2, 10, 35], [2, 1, 0, 4], [0, 1, 1, 5]]
+        for pivoting in self.STRATEGIES:
+            result = build_system(rows).solve(pivoting)
+            self.assertTrue(np.allclose([float(x) for x in result.coordinates], [1, 2, 3]))
+
+    def test_pivoting_records_growth_factor(self):
+        system = build_system([[Decimal('1e-12'), 1, 0, 1], [1, 1, 0, 2], [0, 0, 1, 3]])
+        system.solve(LinearSystem.COMPLETE_PIVOTING)
+        self.assertEqual(system.growth_factor, 1)
+
+    def test_condition_estimate_against_numpy(self):
+        rng = random.Random(31)
+        for _ in range(20):
+            rows = [[rng.randint(-9, 9) for _ in range(4)] for _ in range(3)]
+            a = np.array([row[:3] for row in rows], dtype=float)
+            if abs(np.linalg.det(a)) < 0.5:
+                continue
+            exact = np.linalg.cond(a, 1)
+            for pivoting in self.STRATEGIES[1:]:
+                system = build_system(rows)
+                system.solve(pivoting)
+                estimate = float(system.condition_estimate)
+                self.assertLessEqual(estimate, exact * (1 + 1e-9))
+                self.assertGreaterEqual(estimate, exact / 3)
+
+    def test_condition_estimate_of_ill_conditioned_system(self):
+        epsilon = Decimal('1e-8')
+        system = build_system([[1, 1, 0, 2], [1, 1 + epsilon, 0, 2], [0, 0, 1, 1]])
+        system.solve(LinearSystem.PARTIAL_PIVOTING)
+        self.assertAlmostEqual(float(system.condition_estimate) / 4e8, 1, places=6)
+
+    def test_no_condition_estimate_without_full_rank(self):
+        for rows in ([[1, 2, 3, 1], [2, 4, 6, 2], [0, 1, 1, 1]], [[1, 0, 0, 1], [0, 1, 0, 1]]):
+            for pivoting in self.STRATEGIES:
+                system = build_system(rows)
+                system.solve(pivoting)
+                self.assertIsNone(system.condition_estimate)
+
+    def test_elimination_leaves_planes_untouched(self):
+        rows = [[1, 2, 10, 35], [2, 1, 0, 4], [0, 1, 1, 5]]
+        system = build_system(rows)
+        planes = list(system.planes)
+        for pivoting in self.STRATEGIES:
+            system.solve(pivoting)
+            self.assertEqual(system.planes, planes)
+            for plane, row in zip(system.planes, rows):
+                self.assertEqual(plane.normal_vector, Vector(row[:3]))
+                self.assertEqual(plane.constant_term, row[3])
+
+    def test_unknown_pivoting(self):
+        with self.assertRaises(ValueError):
+            build_system([[1, 0, 0, 1]]).solve('diagonal')
+
+
+class ParametrizationTest(unittest.TestCase):
+
+    def setUp(self):
+        # The line x_1 = 1 + t, x_2 = 2, x_3 = 3 - t
+        self.line = Parametrization(Vector([1, 2, 3]), [Vector([1, 0, -1])])
+        # The plane x_3 = 1, spanned by two non orthogonal directions
+        self.plane = Parametrization(Vector([0, 0, 1]), [Vector([1, 1, 0]), Vector([1, 0, 0])])
+
+    def test_evaluate_batch(self):
+        self.assertTrue(np.allclose(self.line.evaluate([0, 1, -2]), [[1, 2, 3], [2, 2, 2], [-1, 2, 5]]))
+        self.assertTrue(np.allclose(self.line.evaluate([[1]]), [[2, 2, 2]]))
+        self.assertTrue(np.allclose(self.plane.evaluate([[1, 1], [0, -1]]), [[2, 1, 1], [-1, 0, 1]]))
+        with self.assertRaises(ValueError):
+            self.plane.evaluate([[1, 2, 3]])
+
+    def test_project_and_distance(self):
+        points = np.array([[1, 2, 3], [3, 2, 3], [1, 5, 3], [0, 0, 0]], dtype=float)
+        self.assertTrue(np.allclose(self.line.project(points), [[1, 2, 3], [2, 2, 2], [1, 2, 3], [2, 2, 2]]))
+        self.assertTrue(np.allclose(self.line.distance(points), [0, np.sqrt(2), 3, np.sqrt(12)]))
+        self.assertEqual(list(self.line.contains(points)), [True, False, False, False])
+
+        self.assertTrue(np.allclose(self.plane.project([[4, -2, 7]]), [[4, -2, 1]]))
+        self.assertTrue(np.allclose(self.plane.distance([[4, -2, 7], [5, 5, 1]]), [6, 0]))
+
+    def test_points_must_match_dimension(self):
+        with self.assertRaises(ValueError):
+            self.line.distance([[1, 2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from vector import Vector
+from subspace import Subspace
+
+
+class SubspaceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(28)
+
+    def assert_orthonormal(self, subspace):
+        self.assertTrue(np.allclose(subspace.basis.dot(subspace.basis.T), np.eye(subspace.rank)))
+
+    def test_rank_with_dependent_vectors(self):
+        a, b = Vector([1, 2, 0, 1]), Vector([0, 1, 1, 0])
+        subspace = Subspace([a, b, a.plus(b), b.times_scalar(-3)])
+        self.assertEqual(subspace.rank, 2)
+        self.assert_orthonormal(subspace)
+
+    def test_rank_ignores_tiny_vectors(self):
+        subspace = Subspace([Vector([1, 0, 0]), Vector([0, '1e-14', 0]), Vector([0, 0, 0])])
+        self.assertEqual(subspace.rank, 1)
+        self.assertEqual(Subspace([], dimension=3).rank, 0)
+
+    def test_extend(self):
+        subspace = Subspace([Vector([1, 1, 0, 0])])
+        projector = subspace.projector
+        self.assertEqual(subspace.extend([Vector([2, 2, 0, 0])]), 0)
+        self.assertIs(subspace.projector, projector)
+
+        self.assertEqual(subspace.extend([Vector([1, 0, 0, 0]), Vector([0, 1, 0, 0]), Vector([0, 0, 1, 1])]), 2)
+        self.assertEqual(subspace.rank, 3)
+        self.assertIsNot(subspace.projector, projector)
+        self.assert_orthonormal(subspace)
+        self.assertTrue(np.allclose(subspace.project([[0, 0, 1, 1]]), [[0, 0, 1, 1]]))
+
+    def test_project_reject_decompose_against_least_squares(self):
+        spanning = self.rng.randn(3, 6)
+        points = self.rng.randn(20, 6)
+        subspace = Subspace(spanning)
+        self.assert_orthonormal(subspace)
+
+        coefficients = np.linalg.lstsq(spanning.T, points.T, rcond=None)[0]
+        expected = spanning.T.dot(coefficients).T
+        self.assertTrue(np.allclose(subspace.project(points), expected))
+        self.assertTrue(np.allclose(subspace.reject(points), points - expected))
+
+        parallel, orthogonal = subspace.decompose(points)
+        self.assertTrue(np.allclose(parallel, expected))
+        self.assertTrue(np.allclose(orthogonal, points - expected))
+        self.assertTrue(np.allclose(orthogonal.dot(spanning.T), 0))
+        self.assertTrue(subspace.contains(parallel).all())
+
+    def test_matches_vector_components(self):
+        base, v = Vector([3, -1, 2]), Vector([1, 4, -2])
+        parallel, orthogonal = Subspace([base]).decompose(v)
+        self.assertTrue(np.allclose(parallel[0], [float(x) for x in v.parallel_component_to(base).coordinates]))
+        self.assertTrue(np.allclose(orthogonal[0], [float(x) for x in v.orthogonal_component_to(base).coordinates]))
+
+    def test_dimension_mismatch(self):
+        with self.assertRaises(ValueError):
+            Subspace([Vector([1, 2]), Vector([1, 2, 3])])
+        with self.assertRaises(ValueError):
+            Subspace([Vector([1, 2, 3])]).project([Vector([1, 2])])
+        with self.assertRaises(ValueError):
+            Subspace([])
+
+
+if __name__ == '__main__':
+    unittest.main()
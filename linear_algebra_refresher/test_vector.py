@@ -0,0 +1,76 @@
+import unittest
+from decimal import Decimal
+
+from vector import Vector, MutableVector
+
+
+class VectorKernelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.v = Vector([1, 2, 3])
+        self.w = Vector([4, -5, '0.5'])
+
+    def test_axpy(self):
+        self.assertEqual(self.v.axpy(2, self.w), Vector([9, -8, 4]))
+        self.assertEqual(self.v.axpy(Decimal('-0.5'), self.w), self.v.plus(self.w.times_scalar('-0.5')))
+        self.assertEqual(self.v, Vector([1, 2, 3]))
+
+    def test_linear_combination(self):
+        u = Vector([0, 1, 0])
+        self.assertEqual(Vector.linear_combination([2, -1, 3], [self.v, self.w, u]), Vector([-2, 12, '5.5']))
+        self.assertEqual(Vector.linear_combination([1], [self.w]), self.w)
+
+    def test_sum_of(self):
+        self.assertEqual(Vector.sum_of([self.v, self.w, self.v]), Vector([6, -1, '6.5']))
+
+    def test_in_place_operators(self):
+        v = self.v.mutable_copy()
+        v += self.w
+        self.assertEqual(v, Vector([5, -3, '3.5']))
+        v -= self.v
+        self.assertEqual(v, self.w)
+        v *= 2
+        self.assertEqual(v, Vector([8, -10, 1]))
+        v.add_scaled('0.5', self.v)
+        self.assertEqual(v, Vector([Decimal('8.5'), -9, Decimal('2.5')]))
+        self.assertEqual(self.v, Vector([1, 2, 3]))
+
+    def test_in_place_operators_on_itself(self):
+        v = MutableVector([1, 2, 3])
+        v += v
+        self.assertEqual(v, Vector([2, 4, 6]))
+        v -= v
+        self.assertEqual(v, Vector([0, 0, 0]))
+
+    def test_in_place_operators_keep_the_object(self):
+        v = self.v.mutable_copy()
+        same = v
+        v += self.w
+        v *= 3
+        self.assertIs(v, same)
+        self.assertIsInstance(v.frozen(), Vector)
+        self.assertNotIsInstance(v.frozen(), MutableVector)
+
+    def test_dimension_mismatch(self):
+        short = Vector([1, 2])
+        with self.assertRaises(ValueError):
+            self.v.axpy(1, short)
+        with self.assertRaises(ValueError):
+            Vector.linear_combination([1, 1], [self.v, short])
+        with self.assertRaises(ValueError):
+            Vector.linear_combination([1], [self.v, self.w])
+        with self.assertRaises(ValueError):
+            Vector.sum_of([self.v, short])
+        with self.assertRaises(ValueError):
+            Vector.sum_of([])
+
+        v = self.v.mutable_copy()
+        with self.assertRaises(ValueError):
+            v += short
+        with self.assertRaises(ValueError):
+            v -= short
+        self.assertEqual(v, self.v)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 from math import sqrt, acos, pi
 from decimal import Decimal, getcontext
-
-getcontext().prec = 30
+from itertools import imap, izip
+from operator import add, sub
 
 
 class Vector(object):
@@ -20,11 +20,20 @@ class Vector(object):
         except TypeError:
             raise TypeError('The coordinates must be an iterable')
 
+    @classmethod
+    def from_decimals(cls, coordinates):
+        # Trusted constructor for coordinates produced by the library itself: they are already Decimals
+        # and nonempty, so they are neither validated nor converted again
+        v = cls.__new__(cls)
+        v.coordinates = tuple(coordinates)
+        v.dimension = len(v.coordinates)
+        return v
+
     def __str__(self):
-        return 'Vector: {}'.format(self.coordinates)
+        return 'Vector: {}'.format(tuple(self.coordinates))
 
     def __eq__(self, v):
-        return self.coordinates == v.coordinates
+        return tuple(self.coordinates) == tuple(v.coordinates)
 
     def __getitem__(self, index):
         return self.coordinates[index]
@@ -33,19 +42,62 @@ class Vector(object):
         if self.dimension != v.dimension:
             raise ValueError('Vectors must have the same number of dimensions to be added')
 
-        new_coordinates = [x + y for x, y in zip(self.coordinates, v.coordinates)]
-        return Vector(new_coordinates)
+        return Vector.from_decimals(imap(add, self.coordinates, v.coordinates))
 
     def minus(self, other):
         if self.dimension != other.dimension:
             raise ValueError('Vectors must have the same number of dimensions to be substracted')
 
-        new_coordinates = [x - y for x, y in zip(self.coordinates, other.coordinates)]
-        return Vector(new_coordinates)
+        return Vector.from_decimals(imap(sub, self.coordinates, other.coordinates))
 
     def times_scalar(self, c):
-        new_coordinates = [Decimal(c) * x for x in self.coordinates]
-        return Vector(new_coordinates)
+        c = Vector.as_decimal(c)
+        return Vector.from_decimals(c * x for x in self.coordinates)
+
+    def axpy(self, c, other):
+        # Fused self + c * other in a single pass: the coordinates tuple is the only sequence built, where
+        # times_scalar + plus build an intermediate Vector
+        if self.dimension != other.dimension:
+            raise ValueError('Vectors must have the same number of dimensions to be added')
+
+        c = Vector.as_decimal(c)
+        return Vector.from_decimals(x + c * y for x, y in izip(self.coordinates, other.coordinates))
+
+    @staticmethod
+    def linear_combination(coefficients, vectors):
+        # sum(c_i * v_i) accumulated coordinate by coordinate, without intermediate Vectors
+        if not vectors or len(coefficients) != len(vectors):
+            raise ValueError('There must be one coefficient per vector and at least one vector')
+
+        dimension = vectors[0].dimension
+        if any(v.dimension != dimension for v in vectors):
+            raise ValueError('Vectors must have the same number of dimensions to be combined')
+
+        coefficients = [Vector.as_decimal(c) for c in coefficients]
+        first = coefficients[0]
+        accumulated = [first * x for x in vectors[0].coordinates]
+        for c, v in izip(coefficients[1:], vectors[1:]):
+            for i, x in enumerate(v.coordinates):
+                accumulated[i] += c * x
+        return Vector.from_decimals(accumulated)
+
+    @staticmethod
+    def sum_of(vectors):
+        if not vectors:
+            raise ValueError('There must be at least one vector to add')
+
+        dimension = vectors[0].dimension
+        if any(v.dimension != dimension for v in vectors):
+            raise ValueError('Vectors must have the same number of dimensions to be added')
+
+        return Vector.from_decimals(sum(column) for column in izip(*[v.coordinates for v in vectors]))
+
+    def mutable_copy(self):
+        return MutableVector.from_decimals(self.coordinates)
+
+    @staticmethod
+    def as_decimal(c):
+        return c if isinstance(c, Decimal) else Decimal(c)
 
     def magnitude(self):
         coordinates_squared = [x**2 for x in self.coordinates]
@@ -124,7 +176,54 @@ class Vector(object):
         return self.area_of_parallelogram_with(other) / 2.0
 
 
+class MutableVector(Vector):
+    # Vector backed by a list that the in place operators update, for accumulating without a new Vector per step
+
+    @classmethod
+    def from_decimals(cls, coordinates):
+        v = cls.__new__(cls)
+        v.coordinates = list(coordinates)
+        v.dimension = len(v.coordinates)
+        return v
+
+    def __init__(self, coordinates):
+        super(MutableVector, self).__init__(coordinates)
+        self.coordinates = list(self.coordinates)
+
+    def __setitem__(self, index, value):
+        self.coordinates[index] = Vector.as_decimal(value)
+
+    def __iadd__(self, other):
+        return self.add_scaled(1, other)
+
+    def __isub__(self, other):
+        return self.add_scaled(-1, other)
+
+    def __imul__(self, c):
+        c = Vector.as_decimal(c)
+        coordinates = self.coordinates
+        for i in range(self.dimension):
+            coordinates[i] *= c
+        return self
+
+    def add_scaled(self, c, other):
+        # In place axpy: self += c * other
+        if self.dimension != other.dimension:
+            raise ValueError('Vectors must have the same number of dimensions to be added')
+
+        c = Vector.as_decimal(c)
+        coordinates = self.coordinates
+        for i, y in enumerate(other.coordinates):
+            coordinates[i] += c * y
+        return self
+
+    def frozen(self):
+        return Vector.from_decimals(self.coordinates)
+
+
 def main():
+    getcontext().prec = 30
+
     a = Vector([8.462, 7.893, -8.187])
     b = Vector([6.984, -5.975, 4.778])
     c = a.cross(b)